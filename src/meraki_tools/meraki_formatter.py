@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class FormattingOptions:
     """Configuration options for the formatter."""
     indent_size: int = 4
@@ -10,8 +10,15 @@ class FormattingOptions:
 
 
 class MerakiFormatter:
+    # Number of indent levels whose prefix strings are built up front
+    CACHED_INDENT_LEVELS = 32
+    
     def __init__(self, options: Optional[FormattingOptions] = None):
         self.options = options or FormattingOptions()
+        self._indents = [
+            " " * (self.options.indent_size * level)
+            for level in range(self.CACHED_INDENT_LEVELS)
+        ]
     
     def format_string(self, content: str) -> str:
         """Format a Meraki config string according to style rules."""
@@ -28,6 +35,12 @@ class MerakiFormatter:
                 formatted_lines.append("")
                 continue
             
+            # Comment-only lines are kept as written, even when the text
+            # holds braces or separators
+            if stripped.startswith("#"):
+                formatted_lines.append(self._indent(indent_level) + stripped)
+                continue
+            
             # Handle block start/end
             if "{" in stripped:
                 formatted = self._format_line(stripped, indent_level)
@@ -38,7 +51,7 @@ class MerakiFormatter:
                 
             if "}" in stripped:
                 indent_level -= 1
-                formatted = " " * (self.options.indent_size * indent_level) + "}"
+                formatted = self._indent(indent_level) + "}"
                 formatted_lines.append(formatted)
                 in_block = False
                 continue
@@ -49,34 +62,45 @@ class MerakiFormatter:
         
         return "\n".join(formatted_lines)
     
+    def _indent(self, indent_level: int) -> str:
+        """Get the indentation prefix for a nesting level."""
+        if 0 <= indent_level < self.CACHED_INDENT_LEVELS:
+            return self._indents[indent_level]
+        return " " * (self.options.indent_size * indent_level)
+    
     def _format_line(self, line: str, indent_level: int) -> str:
         """Format a single line with proper indentation and spacing."""
-        # Split into components
-        if "=" in line:  # Modifier definition
+        # Classify the line from the position of its first separators in the
+        # code; separators inside a trailing comment don't count
+        code = line.partition("#")[0]
+        equals = code.find("=")
+        colon = code.find(":")
+        if equals >= 0 and (colon < 0 or equals < colon):  # Modifier definition
             return self._format_modifier_def(line, indent_level)
-        elif ":" in line:  # Keybinding or nested binding
-            if "-" in line and not line.startswith("h") and not line.startswith("t"):  # Regular keybinding
+        elif colon >= 0:  # Keybinding or nested binding
+            # Only a keybinding has a "-" before its ":"; one in the action doesn't count
+            if code.find("-", 0, colon) >= 0:  # Regular keybinding
                 return self._format_keybinding(line, indent_level)
             else:  # Nested binding
                 return self._format_nested_binding(line, indent_level)
         else:  # Comment or other
-            return " " * (self.options.indent_size * indent_level) + line.strip()
+            return self._indent(indent_level) + line.strip()
     
     def _format_modifier_def(self, line: str, indent_level: int) -> str:
         """Format a modifier definition line."""
         # Split into components and handle comments
-        parts = line.split("#", 1)
-        definition = parts[0].strip()
-        comment = parts[1].strip() if len(parts) > 1 else ""
+        definition, _, comment = line.partition("#")
+        definition = definition.strip()
+        comment = comment.strip()
         
         # Split definition into name and keys
-        name, keys = definition.split("=", 1)
+        name, _, keys = definition.partition("=")
         # Split keys and add + between them
         key_parts = [k.strip() for k in keys.split("+")]
         keys = " + ".join(key_parts)
         
         formatted = (
-            " " * (self.options.indent_size * indent_level) +
+            self._indent(indent_level) +
             f"{name.strip()} = {keys}"
         )
         
@@ -92,16 +116,16 @@ class MerakiFormatter:
     def _format_keybinding(self, line: str, indent_level: int) -> str:
         """Format a keybinding line."""
         # Split into components and handle comments
-        parts = line.split("#", 1)
-        binding = parts[0].strip()
-        comment = parts[1].strip() if len(parts) > 1 else ""
+        binding, _, comment = line.partition("#")
+        binding = binding.strip()
+        comment = comment.strip()
         
         # Split binding into modifier, key, and action
-        mod_key, action = binding.split(":", 1)
-        mod, key = mod_key.split("-", 1)
+        mod_key, _, action = binding.partition(":")
+        mod, _, key = mod_key.partition("-")
         
         formatted = (
-            " " * (self.options.indent_size * indent_level) +
+            self._indent(indent_level) +
             f"{mod.strip()} - {key.strip()} : {action.strip()}"
         )
         
@@ -117,15 +141,15 @@ class MerakiFormatter:
     def _format_nested_binding(self, line: str, indent_level: int) -> str:
         """Format a nested binding line."""
         # Split into components and handle comments
-        parts = line.split("#", 1)
-        binding = parts[0].strip()
-        comment = parts[1].strip() if len(parts) > 1 else ""
+        binding, _, comment = line.partition("#")
+        binding = binding.strip()
+        comment = comment.strip()
         
         # Split binding into key and action
-        key, action = binding.split(":", 1)
+        key, _, action = binding.partition(":")
         
         formatted = (
-            " " * (self.options.indent_size * indent_level) +
+            self._indent(indent_level) +
             f"{key.strip()} : {action.strip()}"
         )
         
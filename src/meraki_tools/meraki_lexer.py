@@ -11,10 +11,10 @@ Token Types:
     - Special: whitespace, newline, comment
 """
 
+import re
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Iterator
-import re
+from typing import Callable, Dict, Iterator, Tuple, Union
 
 
 class TokenType(Enum):
@@ -47,7 +47,7 @@ class TokenType(Enum):
     EOF = auto()            # end of file
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     """Represents a single token in the input stream."""
     type: TokenType
@@ -72,66 +72,141 @@ class LexerError(Exception):
         super().__init__(f"Line {line}, Column {column}: {message}")
 
 
+# Characters that always form a token on their own
+_SINGLE_CHAR_TOKENS = {
+    '\n': TokenType.NEWLINE,
+    ':': TokenType.COLON,
+    '~': TokenType.TILDE,
+    ';': TokenType.SEMICOLON,
+    '=': TokenType.EQUALS,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    ',': TokenType.COMMA,
+}
+
+# The rest of an identifier or of raw text, after its first character.
+# Matching the run as a character class keeps the per-character loop in C
+_match_identifier_rest = re.compile(r'[a-z0-9_]*').match
+_match_text_rest = re.compile(r'[^"#{}\[\]~;:=+,\s]*').match
+
+# A scanner takes the input and the offset of the token's first character
+# and returns (token type, end offset). A type of None means no token
+# can start at that offset.
+ScanResult = Tuple[Union[TokenType, str, None], int]
+
+
+def _is_word_char(char: str) -> bool:
+    """Check if a character is a word character or a '-'."""
+    return char.isalnum() or char in '_-'
+
+
+def _is_operator(text: str, pos: int) -> bool:
+    """Check if the '+' or '-' at ``pos`` stands alone, not inside a word."""
+    if pos > 0 and _is_word_char(text[pos - 1]):
+        return False
+    return not (pos + 1 < len(text) and _is_word_char(text[pos + 1]))
+
+
+def _scan_whitespace(text: str, pos: int) -> ScanResult:
+    """Scan a run of spaces and tabs."""
+    end = pos + 1
+    while end < len(text) and text[end] in ' \t':
+        end += 1
+    return TokenType.WHITESPACE, end
+
+
+def _scan_comment(text: str, pos: int) -> ScanResult:
+    """Scan a comment up to (not including) the end of the line."""
+    end = text.find('\n', pos)
+    return TokenType.COMMENT, len(text) if end < 0 else end
+
+
+def _scan_plus(text: str, pos: int) -> ScanResult:
+    """Scan a '+' operator; a '+' attached to a word is invalid."""
+    if _is_operator(text, pos):
+        return TokenType.PLUS, pos + 1
+    return None, pos
+
+
+def _scan_minus(text: str, pos: int) -> ScanResult:
+    """Scan a '-' operator; a '-' attached to a word starts raw text."""
+    if _is_operator(text, pos):
+        return TokenType.MINUS, pos + 1
+    return _scan_text(text, pos)
+
+
+def _scan_string(text: str, pos: int) -> ScanResult:
+    """Scan a quoted string, which must close on the same line."""
+    line_end = text.find('\n', pos + 1)
+    if line_end < 0:
+        line_end = len(text)
+    close = text.find('"', pos + 1, line_end)
+    if close >= 0:
+        return TokenType.STRING, close + 1
+    if line_end >= len(text) - 1:
+        # Nothing but the final newline follows: the string never closes
+        return 'UNTERMINATED_STRING', line_end
+    return None, pos
+
+
+def _scan_number(text: str, pos: int) -> ScanResult:
+    """Scan a run of digits."""
+    end = pos + 1
+    while end < len(text) and text[end].isdecimal():
+        end += 1
+    return TokenType.NUMBER, end
+
+
+def _scan_identifier(text: str, pos: int) -> ScanResult:
+    """Scan a lowercase identifier."""
+    return TokenType.IDENTIFIER, _match_identifier_rest(text, pos + 1).end()
+
+
+def _scan_text(text: str, pos: int) -> ScanResult:
+    """Scan raw text: anything up to whitespace or a delimiter."""
+    return TokenType.TEXT, _match_text_rest(text, pos + 1).end()
+
+
+def _scan_other(text: str, pos: int) -> ScanResult:
+    """Scan a token starting with a character not in the dispatch table."""
+    char = text[pos]
+    if char.isdecimal():
+        return _scan_number(text, pos)
+    if char.isspace():
+        return None, pos
+    return _scan_text(text, pos)
+
+
+# First-character dispatch table for tokens longer than one character
+_SCANNERS: Dict[str, Callable[[str, int], ScanResult]] = {
+    ' ': _scan_whitespace,
+    '\t': _scan_whitespace,
+    '#': _scan_comment,
+    '+': _scan_plus,
+    '-': _scan_minus,
+    '"': _scan_string,
+}
+_SCANNERS.update(dict.fromkeys('0123456789', _scan_number))
+_SCANNERS.update(dict.fromkeys('abcdefghijklmnopqrstuvwxyz', _scan_identifier))
+
+
 class MerakiLexer:
-    """Lexical analyzer for Meraki configuration files."""
+    """Lexical analyzer for Meraki configuration files.
+    
+    Tokens are recognized by dispatching on their first character: single
+    character tokens come straight from a lookup table, everything else
+    from a small scanner function that finds where the token ends.
+    
+    The lexer keeps no per-call state: all scanning state lives in
+    ``tokenize`` locals, so one instance can be reused (and shared
+    between threads) for any number of inputs.
+    """
     
     # Constants
     MAX_IDENTIFIER_LENGTH = 50
     
-    def __init__(self):
-        """Initialize the lexer with token patterns."""
-        # Token patterns in priority order
-        self.token_specs = [
-            # Whitespace and comments
-            (r'[ \t]+', TokenType.WHITESPACE),
-            (r'#[^\n]*', TokenType.COMMENT),
-            (r'\n', TokenType.NEWLINE),
-            
-            # Operators (must come before identifiers)
-            (r'(?<![\w-])\+(?![\w-])', TokenType.PLUS),  # Plus not part of word
-            (r'(?<![\w-])-(?![\w-])', TokenType.MINUS),  # Minus not part of word
-            (r':', TokenType.COLON),
-            (r'~', TokenType.TILDE),
-            (r';', TokenType.SEMICOLON),
-            (r'=', TokenType.EQUALS),
-            
-            # Delimiters
-            (r'\{', TokenType.LBRACE),
-            (r'\}', TokenType.RBRACE),
-            (r'\[', TokenType.LBRACKET),
-            (r'\]', TokenType.RBRACKET),
-            (r',', TokenType.COMMA),
-            
-            # Strings with error detection
-            (r'"[^"\n]*"', TokenType.STRING),
-            (r'"[^"\n]*$', 'UNTERMINATED_STRING'),
-            
-            # Numbers
-            (r'\d+', TokenType.NUMBER),
-            
-            # Identifiers with length check
-            (fr'[a-z][a-z0-9_]{{{self.MAX_IDENTIFIER_LENGTH},}}',
-             'IDENTIFIER_TOO_LONG'),
-            (r'[a-z][a-z0-9_]*', TokenType.IDENTIFIER),
-            
-            # Raw text (anything else that's not whitespace)
-            (r'[^\s\n"#{}[\]~;:=+,]+', TokenType.TEXT),
-        ]
-        
-        # Build the master regex pattern
-        pattern_parts = [
-            f'(?P<{t[1].name if isinstance(t[1], TokenType) else t[1]}>{t[0]})'
-            for t in self.token_specs
-        ]
-        self.pattern = '|'.join(pattern_parts)
-        self.regex = re.compile(self.pattern)
-        
-        # Initialize state
-        self.input: str = ""
-        self.pos: int = 0
-        self.line: int = 1
-        self.column: int = 1
-    
     def tokenize(self, text: str) -> Iterator[Token]:
         """Convert input text into a stream of tokens.
         
@@ -144,76 +219,57 @@ class MerakiLexer:
         Raises:
             LexerError: If invalid input is encountered
         """
-        self.input = text
-        self.pos = 0
-        self.line = 1
-        self.column = 1
+        # Only NEWLINE tokens span a line break, so the column of any
+        # offset is its distance from the start of the current line
+        line = 1
+        line_start = 0
         
-        while self.pos < len(self.input):
-            # Save the starting position for this token
-            start_line = self.line
-            start_column = self.column
-            
-            match = self.regex.match(self.input, self.pos)
-            
-            if match is None:
-                # No token matches at current position
-                raise LexerError(
-                    f"Invalid character: {self.input[self.pos]}",
-                    self.line,
-                    self.column
-                )
-            
-            # Get the matched token type and value
-            token_type = None
-            value = None
-            for name, type_ in [
-                (t[1].name if isinstance(t[1], TokenType) else t[1], t[1])
-                for t in self.token_specs
-            ]:
-                if match.group(name):
-                    if name == 'UNTERMINATED_STRING':
-                        raise LexerError(
-                            "Unterminated string literal",
-                            start_line,
-                            start_column
-                        )
-                    elif name == 'IDENTIFIER_TOO_LONG':
-                        msg = f"Identifier too long (max {self.MAX_IDENTIFIER_LENGTH} chars)"
-                        raise LexerError(msg, start_line, start_column)
-                    token_type = type_
-                    value = match.group(name)
-                    break
+        pos = 0
+        while pos < len(text):
+            char = text[pos]
+            token_type = _SINGLE_CHAR_TOKENS.get(char)
             
             if token_type is not None:
-                # Skip whitespace tokens
-                if token_type != TokenType.WHITESPACE:
-                    yield Token(
-                        token_type,
-                        value,
-                        start_line,
-                        start_column
-                    )
+                end = pos + 1
+            else:
+                token_type, end = _SCANNERS.get(char, _scan_other)(text, pos)
                 
-                # Update position
-                for char in value:
-                    if char == '\n':
-                        self.line += 1
-                        self.column = 1
-                    else:
-                        self.column += 1
+                # Whitespace runs are consumed without building a token
+                if token_type is TokenType.WHITESPACE:
+                    pos = end
+                    continue
                 
-                self.pos = match.end()
-            else:
-                # This shouldn't happen given our regex pattern
-                raise LexerError(
-                    "Unknown token type",
-                    self.line,
-                    self.column
-                )
+                if token_type is None:
+                    raise LexerError(
+                        f"Invalid character: {char}",
+                        line,
+                        pos - line_start + 1
+                    )
+                elif token_type == 'UNTERMINATED_STRING':
+                    raise LexerError(
+                        "Unterminated string literal",
+                        line,
+                        pos - line_start + 1
+                    )
+                elif (token_type is TokenType.IDENTIFIER
+                      and end - pos > self.MAX_IDENTIFIER_LENGTH):
+                    msg = f"Identifier too long (max {self.MAX_IDENTIFIER_LENGTH} chars)"
+                    raise LexerError(msg, line, pos - line_start + 1)
+            
+            yield Token(
+                token_type,
+                text[pos:end],
+                line,
+                pos - line_start + 1
+            )
+            
+            if token_type is TokenType.NEWLINE:
+                line += 1
+                line_start = end
+            pos = end
         
         # Add EOF token
-        yield Token(TokenType.EOF, "", self.line, self.column)
+        yield Token(TokenType.EOF, "", line, pos - line_start + 1)
 
 
 def create_lexer() -> MerakiLexer:
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Dict, Optional
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Result of AST validation."""
     is_valid: bool
@@ -70,32 +70,36 @@ class MerakiValidator:
                 self._validate_key_combination(binding["key_combination"], modifiers)
             
             # Validate key
-            if "key" in binding and binding["key"] is not None:
-                if not isinstance(binding["key"], str):
+            key = binding.get("key")
+            if key is not None:
+                if not isinstance(key, str):
                     self.errors.append("Invalid key format")
             
             # Validate action or actions
             if "action" not in binding and "actions" not in binding:
                 self.errors.append("Missing action in keybinding")
             elif "actions" in binding:
-                if not isinstance(binding["actions"], list):
+                actions = binding["actions"]
+                if not isinstance(actions, list):
                     self.errors.append("Invalid actions format")
-                elif not all(isinstance(a, dict) and "command" in a for a in binding["actions"]):
+                elif not all(isinstance(a, dict) and "command" in a for a in actions):
                     self.errors.append("Invalid action format in command chain")
             
             # Validate timeout
-            if "timeout" in binding and binding["timeout"] is not None:
-                if not isinstance(binding["timeout"], int):
+            timeout = binding.get("timeout")
+            if timeout is not None:
+                if not isinstance(timeout, int):
                     self.errors.append("Invalid timeout format")
-                elif binding["timeout"] < 0:
+                elif timeout < 0:
                     self.errors.append("Timeout cannot be negative")
             
             # Validate nested bindings
-            if "nested_bindings" in binding and binding["nested_bindings"] is not None:
-                if not isinstance(binding["nested_bindings"], dict):
+            nested_bindings = binding.get("nested_bindings")
+            if nested_bindings is not None:
+                if not isinstance(nested_bindings, dict):
                     self.errors.append("Invalid nested bindings format")
                 else:
-                    self._validate_nested_bindings(binding["nested_bindings"])
+                    self._validate_nested_bindings(nested_bindings)
             
             # Validate line number
             if "line_number" not in binding:
@@ -7,7 +7,7 @@ class CommentType(Enum):
     INLINE = "inline"
     MULTILINE = "multiline"
 
-@dataclass
+@dataclass(slots=True)
 class Comment:
     type: CommentType
     text: str
@@ -15,21 +15,21 @@ class Comment:
     end_line: Optional[int] = None
     associated_code_line: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class ASTNode:
     line_number: int
     comments: List[Comment]
 
-@dataclass
+@dataclass(slots=True)
 class Modifier(ASTNode):
     name: str
     keys: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class Action(ASTNode):
     command: str
 
-@dataclass
+@dataclass(slots=True)
 class KeyBinding(ASTNode):
     key_combination: str
     key: str
@@ -37,7 +37,7 @@ class KeyBinding(ASTNode):
     action: Optional[Action] = None
     nested_bindings: Optional[Dict[str, 'KeyBinding']] = None
 
-@dataclass
+@dataclass(slots=True)
 class MerakiAST:
     modifiers: Dict[str, Modifier]
     keybindings: List[KeyBinding]
@@ -1,25 +1,87 @@
+import dataclasses
+import functools
+import logging
 import re
-from typing import List, Tuple, Dict
-from src.ast_nodes import Comment, CommentType, Modifier, KeyBinding, MerakiAST
-from src.tokenizer import Token, TokenType
-from src.logger import logger
-from src.exceptions import ParseError
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.parser.ast_nodes import Comment, CommentType, Modifier, Action, KeyBinding, MerakiAST
+from src.meraki_tools.meraki_lexer import Token, TokenType
+
+logger = logging.getLogger(__name__)
+
+
+class ParseError(Exception):
+    """Exception raised for syntax errors found while parsing."""
+    def __init__(self, message: str, line: int, column: int):
+        self.message = message
+        self.line = line
+        self.column = column
+        super().__init__(f"Line {line}, Column {column}: {message}")
+
+
+# Token types used once or more per token, bound once: looking a member
+# up on the TokenType class costs an attribute access on every use
+_EOF = TokenType.EOF
+_NEWLINE = TokenType.NEWLINE
+_IDENTIFIER = TokenType.IDENTIFIER
+_STRING = TokenType.STRING
+_TIMEOUT = TokenType.NUMBER  # the lexer's timeout value type
+
+# Token type groups are tuples rather than sets: Enum.__hash__ is Python
+# code, while tuple membership compares by identity first, in C
+
+# Token types that end the rest of a line, and the text of an action
+_LINE_END_TYPES = (_NEWLINE, _EOF)
+_ACTION_END_TYPES = (_NEWLINE, TokenType.SEMICOLON, _EOF)
+
+# Tokens within a single line. An unterminated string runs to the end of
+# the line; '[' and ']' match nothing and are reported as unexpected.
+# Whitespace is matched only to be skipped: no WHITESPACE tokens are made
+_TOKEN_RE = re.compile(r'''
+    (?P<WHITESPACE>\s+)
+  | (?P<EQUALS>=)
+  | (?P<PLUS>\+)
+  | (?P<MINUS>-)
+  | (?P<COLON>:)
+  | (?P<LBRACE>\{)
+  | (?P<RBRACE>\})
+  | (?P<COMMA>,)
+  | (?P<SEMICOLON>;)
+  | "(?P<STRING>[^"]*)"?
+  | (?P<IDENTIFIER>[^\s=+\-:{}\[\];,]+)
+''', re.VERBOSE)
+
+_TOKEN_TYPES = {
+    'EQUALS': TokenType.EQUALS,
+    'PLUS': TokenType.PLUS,
+    'MINUS': TokenType.MINUS,
+    'COLON': TokenType.COLON,
+    'LBRACE': TokenType.LBRACE,
+    'RBRACE': TokenType.RBRACE,
+    'COMMA': TokenType.COMMA,
+    'SEMICOLON': TokenType.SEMICOLON,
+}
+
+# Content larger than this is always parsed afresh to bound cache memory
+MAX_CACHED_CONTENT_LENGTH = 64 * 1024
 
 class MerakiParser:
     def __init__(self):
         """Initialize the parser."""
-        # Regular expressions for comment detection
-        self.line_comment_re = re.compile(r'^\s*#\s*(.*)$')
-        self.inline_comment_re = re.compile(r'([^#]*?)#\s*(.*)$')
-        self.multiline_start_re = re.compile(r'^\s*@END\s*$')
-        self.multiline_end_re = re.compile(r'^\s*END\s*$')
-        
-        # Lexer state
-        self.tokens: List[Token] = []
-        self.current = 0
-        
-        # Comment handling
+        # Lexer state: tokens are pulled from _tokenize on demand, so only
+        # the current and most recently consumed tokens are held. Before
+        # anything is consumed, both are an EOF token at line -1
+        self.tokens: Iterator[Token] = iter(())
+        self.current_token = Token(TokenType.EOF, "", -1, -1)
+        self.previous_token = self.current_token
+        
+        # Non-empty lines of the content being tokenized, indexed by token
+        # line number - 1, so action text can be sliced from the source
+        self.source_lines: List[str] = []
+        
+        # Comment handling: comments not yet attached to a node, and the
+        # same comments indexed by every line they can be attached to
         self.pending_comments: List[Comment] = []
+        self.comments_by_line: Dict[int, List[Comment]] = {}
 
     def extract_comments(self, content: str) -> Tuple[List[Comment], str]:
         """Extract all comments and return them with clean content.
@@ -27,17 +89,38 @@ class MerakiParser:
         This method preserves line numbers by replacing comment-only lines with empty lines.
         For inline comments, it removes only the comment part, keeping the code.
         """
-        lines = content.split('\n')
+        comments, clean_lines = self._extract_comments(content.split('\n'))
+        return comments, '\n'.join(clean_lines)
+
+    def _extract_comments(self, lines: List[str]) -> Tuple[List[Comment], List[str]]:
+        """Extract all comments from the content's lines.
+        
+        Returns the comments and the clean lines, one for each source line,
+        which are tokenized as they are rather than joined and split again.
+        """
         comments: List[Comment] = []
         clean_lines: List[str] = []
         
-        for i, line in enumerate(lines):
-            line = line.rstrip()
+        # Set once a search for an END marker has run off the end of the
+        # content: no later @END can be closed either
+        unterminated = False
+        
+        i = 0
+        while i < len(lines):
+            line = lines[i].rstrip()
             line_number = i + 1
+            i += 1
+            
+            # Most lines hold no comment at all
+            if '#' not in line and '@' not in line:
+                clean_lines.append(line)
+                continue
+            
+            stripped = line.lstrip()
             
             # Check for line comment (entire line is a comment)
-            if line.lstrip().startswith('#'):
-                text = line.lstrip()[1:].lstrip()
+            if stripped.startswith('#'):
+                text = stripped[1:].lstrip()
                 comments.append(Comment(
                     type=CommentType.LINE,
                     text=text,
@@ -47,30 +130,28 @@ class MerakiParser:
                 continue
             
             # Check for multiline comment
-            if line.lstrip() == '@END':
-                start_line = line_number
-                multiline_text = []
+            if stripped == '@END':
                 clean_lines.append('')  # Replace @END with empty line
+                end = None if unterminated else self._find_multiline_end(lines, i)
+                if end is None:
+                    # Without an END marker the following lines are regular content
+                    unterminated = True
+                    continue
                 
-                i += 1
-                while i < len(lines) and lines[i].strip() != 'END':
-                    multiline_text.append(lines[i])
-                    clean_lines.append('')  # Replace comment content with empty lines
-                    i += 1
-                
-                if i < len(lines):  # Found END marker
-                    comments.append(Comment(
-                        type=CommentType.MULTILINE,
-                        text='\n'.join(multiline_text),
-                        line_number=start_line + 1,  # Start after @END
-                        end_line=i + 1  # Include END marker
-                    ))
-                    clean_lines.append('')  # Replace END with empty line
+                comments.append(Comment(
+                    type=CommentType.MULTILINE,
+                    text='\n'.join(lines[i:end]),
+                    line_number=line_number,
+                    end_line=end + 1  # Include END marker
+                ))
+                # Replace comment content and the END marker with empty lines
+                clean_lines.extend([''] * (end + 1 - i))
+                i = end + 1
                 continue
             
             # Check for inline comment
-            if '#' in line:
-                code_part, comment_part = line.split('#', 1)
+            code_part, hash_sign, comment_part = line.partition('#')
+            if hash_sign:
                 comments.append(Comment(
                     type=CommentType.INLINE,
                     text=comment_part.strip(),
@@ -83,25 +164,49 @@ class MerakiParser:
             # No comment found, keep line as is
             clean_lines.append(line)
         
-        clean_content = '\n'.join(clean_lines)
-        logger.debug("Clean content:\n%s", clean_content)
-        logger.debug("Found comments:")
-        for comment in comments:
-            logger.debug("  %s at line %d: %s", 
-                        comment.type, comment.line_number, comment.text)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Clean content:\n%s", '\n'.join(clean_lines))
+            logger.debug("Found comments:")
+            for comment in comments:
+                logger.debug("  %s at line %d: %s", 
+                            comment.type, comment.line_number, comment.text)
         
-        return comments, clean_content
+        return comments, clean_lines
 
     def parse(self, content: str) -> MerakiAST:
-        """Parse Meraki configuration content into an AST."""
+        """Parse Meraki configuration content into an AST.
+        
+        Results are cached by content, so re-parsing an unchanged config
+        only costs a copy of the cached AST, which callers are free to modify.
+        A cached result is not parsed by this instance, so the parser's own
+        state (tokens, source_lines, pending_comments) is unspecified after
+        parse() returns. Subclasses, which may override the parse phases,
+        always parse afresh on their own instance.
+        """
+        # Blank content, e.g. a file just created, holds nothing to parse
+        if not content.strip():
+            return MerakiAST(modifiers={}, keybindings=[], comments=[])
+        if type(self) is not MerakiParser or len(content) > MAX_CACHED_CONTENT_LENGTH:
+            return self._parse(content)
+        return _copy_ast(_parse_cached(content))
+
+    def _parse(self, content: str) -> MerakiAST:
+        """Parse content into an AST, bypassing the result cache."""
         # Phase 1: Extract comments
         logger.debug("Phase 1: Extracting comments")
-        comments, clean_content = self.extract_comments(content)
+        comments, clean_lines = self._extract_comments(content.split('\n'))
         self.pending_comments = comments
+        self.comments_by_line = {}
+        for comment in comments:
+            self.comments_by_line.setdefault(comment.line_number, []).append(comment)
+            if comment.associated_code_line not in (None, comment.line_number):
+                self.comments_by_line.setdefault(comment.associated_code_line, []).append(comment)
         
         # Phase 2: Tokenize clean content
         logger.debug("Phase 2: Tokenizing clean content")
-        self._tokenize(clean_content)
+        self.tokens = self._tokenize(clean_lines)
+        self.previous_token = Token(TokenType.EOF, "", -1, -1)
+        self.current_token = next(self.tokens)
         
         # Phase 3: Parse into AST
         logger.debug("Phase 3: Parsing into AST")
@@ -111,18 +216,18 @@ class MerakiParser:
         # Track current line number
         current_line = 1
         
-        while not self._is_at_end():
-            # Skip whitespace and newlines
-            if self._match(TokenType.WHITESPACE):
-                continue
+        while self.current_token.type != _EOF:
+            token_type = self.current_token.type
             
-            if self._match(TokenType.NEWLINE):
+            # Skip newlines
+            if token_type == _NEWLINE:
+                self._advance()
                 current_line += 1
                 continue
             
             # Parse modifier definition or keybinding
-            if self._match(TokenType.IDENTIFIER):
-                name = self._previous().value
+            if token_type == _IDENTIFIER:
+                name = self._advance().value
                 line_number = current_line
                 logger.debug("Found identifier '%s' at line %d", name, line_number)
                 self._skip_whitespace()
@@ -143,8 +248,22 @@ class MerakiParser:
                         self._peek().line,
                         self._peek().column
                     )
+            else:
+                # Nothing else can start a statement; without this the
+                # loop would never get past the token
+                raise ParseError(
+                    "Expected modifier definition or keybinding",
+                    self._peek().line,
+                    self._peek().column
+                )
         
         # Return AST with any remaining unattached comments
+        unattached = {
+            id(comment) for line in self.comments_by_line.values() for comment in line
+        }
+        self.pending_comments = [
+            comment for comment in self.pending_comments if id(comment) in unattached
+        ]
         logger.debug("Returning AST with %d modifiers and %d keybindings",
                     len(modifiers), len(keybindings))
         return MerakiAST(
@@ -153,130 +272,58 @@ class MerakiParser:
             comments=self.pending_comments
         ) 
 
-    def _tokenize(self, content: str) -> None:
-        """Tokenize the clean content."""
-        self.tokens = []
-        lines = content.split('\n')
+    def _tokenize(self, lines: List[str]) -> Iterator[Token]:
+        """Tokenize the clean lines, yielding tokens as they are found."""
+        # Checked once up front: per-token debug calls dominate otherwise
+        debug = logger.isEnabledFor(logging.DEBUG)
         
-        # Track line numbers
-        line_map = {}
-        current_line = 1
-        for i, line in enumerate(lines, 1):
-            if line.strip():  # Only map non-empty lines
-                line_map[i] = current_line
-                current_line += 1
-        
-        logger.debug("Line mapping: %s", line_map)
+        # Tokens are numbered by non-empty line, counted as they are reached
+        line_number = 0
+        self.source_lines = []
         
         for line_num, line in enumerate(lines, 1):
             if not line.strip():  # Skip empty lines
                 continue
+            line_number += 1
+            self.source_lines.append(line)
                 
-            logger.debug("Tokenizing line %d: %s", line_num, line)
+            if debug:
+                logger.debug("Tokenizing line %d: %s", line_num, line)
             col = 0
-            i = 0
-            while i < len(line):
-                char = line[i]
-                logger.debug("  Processing char '%s' at position %d", char, i)
+            for match in _TOKEN_RE.finditer(line):
+                start = match.start()
+                if start != col:
+                    raise ParseError(f"Unexpected character '{line[col]}'", line_number, col)
+                col = match.end()
                 
-                # Skip whitespace
-                if char.isspace():
-                    spaces = ''
-                    while i < len(line) and line[i].isspace():
-                        spaces += line[i]
-                        i += 1
-                    if spaces:
-                        logger.debug("  Found whitespace: '%s'", spaces)
-                        self.tokens.append(Token(TokenType.WHITESPACE, spaces, line_map[line_num], col))
-                        col += len(spaces)
+                kind = match.lastgroup
+                if kind == 'WHITESPACE':
                     continue
-                
-                # Handle operators and special characters
-                if char == '=':
-                    logger.debug("  Found equals")
-                    self.tokens.append(Token(TokenType.EQUALS, char, line_map[line_num], col))
-                    i += 1
-                    col += 1
-                elif char == '+':
-                    logger.debug("  Found plus")
-                    self.tokens.append(Token(TokenType.PLUS, char, line_map[line_num], col))
-                    i += 1
-                    col += 1
-                elif char == '-':
-                    logger.debug("  Found minus")
-                    self.tokens.append(Token(TokenType.MINUS, char, line_map[line_num], col))
-                    i += 1
-                    col += 1
-                elif char == ':':
-                    logger.debug("  Found colon")
-                    self.tokens.append(Token(TokenType.COLON, char, line_map[line_num], col))
-                    i += 1
-                    col += 1
-                elif char == '{':
-                    logger.debug("  Found left brace")
-                    self.tokens.append(Token(TokenType.LBRACE, char, line_map[line_num], col))
-                    i += 1
-                    col += 1
-                elif char == '}':
-                    logger.debug("  Found right brace")
-                    self.tokens.append(Token(TokenType.RBRACE, char, line_map[line_num], col))
-                    i += 1
-                    col += 1
-                elif char == ',':
-                    logger.debug("  Found comma")
-                    self.tokens.append(Token(TokenType.COMMA, char, line_map[line_num], col))
-                    i += 1
-                    col += 1
-                elif char == ';':
-                    logger.debug("  Found semicolon")
-                    self.tokens.append(Token(TokenType.SEMICOLON, char, line_map[line_num], col))
-                    i += 1
-                    col += 1
-                # Handle strings
-                elif char == '"':
-                    logger.debug("  Found string start")
-                    string_value = ''
-                    i += 1  # Skip opening quote
-                    col += 1
-                    while i < len(line) and line[i] != '"':
-                        string_value += line[i]
-                        i += 1
-                        col += 1
-                    if i < len(line):  # Skip closing quote
-                        i += 1
-                        col += 1
-                    logger.debug("  Found string: '%s'", string_value)
-                    self.tokens.append(Token(TokenType.STRING, string_value, line_map[line_num], col - len(string_value)))
-                # Handle identifiers and text
+                value = match.group(kind)
+                if kind == 'STRING':
+                    # Strings keep the historical column: the end of the
+                    # token minus the length of its unquoted value
+                    yield Token(_STRING, value, line_number, col - len(value))
+                elif kind == 'IDENTIFIER':
+                    # Check if it's a timeout value
+                    token_type = _TIMEOUT if value.endswith('ms') else _IDENTIFIER
+                    yield Token(token_type, value, line_number, start)
                 else:
-                    identifier = ''
-                    start_col = col
-                    while i < len(line) and not line[i].isspace() and line[i] not in '=+-:{}[];,':
-                        identifier += line[i]
-                        i += 1
-                        col += 1
-                    if identifier:
-                        # Check if it's a timeout value
-                        if identifier.endswith('ms'):
-                            logger.debug("  Found timeout: '%s'", identifier)
-                            self.tokens.append(Token(TokenType.TIMEOUT, identifier, line_map[line_num], start_col))
-                        else:
-                            logger.debug("  Found identifier: '%s'", identifier)
-                            self.tokens.append(Token(TokenType.IDENTIFIER, identifier, line_map[line_num], start_col))
+                    yield Token(_TOKEN_TYPES[kind], value, line_number, start)
+                if debug:
+                    logger.debug("  Found %s: '%s'", kind, value)
+            
+            if col != len(line):
+                raise ParseError(f"Unexpected character '{line[col]}'", line_number, col)
             
             # Add newline token at the end of each line
-            logger.debug("  Adding newline")
-            self.tokens.append(Token(TokenType.NEWLINE, '\n', line_map[line_num], col))
+            if debug:
+                logger.debug("  Adding newline")
+            yield Token(TokenType.NEWLINE, '\n', line_number, col)
         
         # Add EOF token
         logger.debug("Adding EOF token")
-        self.tokens.append(Token(TokenType.EOF, '', current_line, 0))
-        
-        # Log all tokens
-        logger.debug("Final token stream:")
-        for token in self.tokens:
-            logger.debug("  %s: '%s' at line %d, col %d", 
-                        token.type, token.value, token.line, token.column)
+        yield Token(TokenType.EOF, '', line_number + 1, 0)
 
     def _parse_modifier_definition(self, name: str, line_number: int) -> Modifier:
         """Parse a modifier definition after the equals sign."""
@@ -317,7 +364,7 @@ class MerakiParser:
         logger.debug("Found second key: %s", key2)
         
         # Skip to end of line
-        while not self._is_at_end() and not self._check(TokenType.NEWLINE):
+        while self.current_token.type not in _LINE_END_TYPES:
             self._advance()
         
         # Skip the newline
@@ -352,7 +399,7 @@ class MerakiParser:
         timeout = None
         self._skip_whitespace()
         if self._match(TokenType.LBRACE):
-            if not self._match(TokenType.TIMEOUT):
+            if not self._match(_TIMEOUT):
                 raise ParseError(
                     "Expected timeout value",
                     self._peek().line,
@@ -383,6 +430,7 @@ class MerakiParser:
                 self._peek().line,
                 self._peek().column
             )
+        colon = self._previous()
         
         self._skip_whitespace()
         
@@ -395,34 +443,15 @@ class MerakiParser:
             nested_bindings = self._parse_nested_bindings(line_number)
         else:
             # Parse action until newline or semicolon
-            action_text = []
-            while not self._is_at_end():
-                if self._check(TokenType.NEWLINE, TokenType.SEMICOLON):
-                    break
-                if self._match(TokenType.IDENTIFIER, TokenType.STRING):
-                    action_text.append(self._previous().value)
-                elif self._match(TokenType.WHITESPACE):
-                    if action_text:  # Only add space if we have text
-                        action_text.append(' ')
-                else:
-                    # Skip any other token
-                    self._advance()
-            
-            if action_text:
-                # Join and clean up extra spaces
-                command = ' '.join(''.join(action_text).split())
-                action = Action(
-                    line_number=line_number,
-                    comments=[],
-                    command=command
-                )
-                logger.debug("Found action: %s", command)
+            action = self._parse_action(colon, line_number)
+            if action:
+                logger.debug("Found action: %s", action.command)
             
             # Skip semicolon if present
             self._match(TokenType.SEMICOLON)
             
             # Skip to end of line
-            while not self._is_at_end() and not self._check(TokenType.NEWLINE):
+            while self.current_token.type not in _LINE_END_TYPES:
                 self._advance()
             
             # Skip the newline
@@ -444,6 +473,7 @@ class MerakiParser:
     def _parse_nested_bindings(self, parent_line: int) -> Dict[str, KeyBinding]:
         """Parse nested keybindings inside braces."""
         logger.debug("Parsing nested bindings")
+        debug = logger.isEnabledFor(logging.DEBUG)
         bindings = {}
         
         while not self._is_at_end():
@@ -455,7 +485,8 @@ class MerakiParser:
             if self._match(TokenType.IDENTIFIER):
                 key = self._previous().value
                 line_number = self._previous().line
-                logger.debug("Found nested key: %s", key)
+                if debug:
+                    logger.debug("Found nested key: %s", key)
                 
                 self._skip_whitespace()
                 if not self._match(TokenType.COLON):
@@ -464,31 +495,14 @@ class MerakiParser:
                         self._peek().line,
                         self._peek().column
                     )
+                colon = self._previous()
                 
                 # Parse the nested binding's action
                 self._skip_whitespace()
-                action_text = []
-                while not self._is_at_end():
-                    if self._check(TokenType.NEWLINE, TokenType.SEMICOLON):
-                        break
-                    if self._match(TokenType.IDENTIFIER, TokenType.STRING):
-                        action_text.append(self._previous().value)
-                    elif self._match(TokenType.WHITESPACE):
-                        if action_text:  # Only add space if we have text
-                            action_text.append(' ')
-                    else:
-                        # Skip any other token
-                        self._advance()
-                
-                if action_text:
-                    # Join and clean up extra spaces
-                    command = ' '.join(''.join(action_text).split())
-                    action = Action(
-                        line_number=line_number,
-                        comments=[],
-                        command=command
-                    )
-                    logger.debug("Found nested action: %s", command)
+                action = self._parse_action(colon, line_number)
+                if action:
+                    if debug:
+                        logger.debug("Found nested action: %s", action.command)
                     
                     bindings[key] = KeyBinding(
                         line_number=line_number,
@@ -501,61 +515,135 @@ class MerakiParser:
                 
                 # Skip semicolon if present
                 self._match(TokenType.SEMICOLON)
+            elif not self._is_at_end():
+                raise ParseError(
+                    "Expected key or '}' in nested bindings",
+                    self._peek().line,
+                    self._peek().column
+                )
             
             self._skip_whitespace()
         
         return bindings
 
+    def _find_multiline_end(self, lines: List[str], start: int) -> Optional[int]:
+        """Find the index of the END line closing a multiline comment."""
+        for i in range(start, len(lines)):
+            if lines[i].strip() == 'END':
+                return i
+        return None
+
+    def _parse_action(self, colon: Token, line_number: int) -> Optional[Action]:
+        """Parse the action following a ':', or None if it is empty."""
+        command = self._parse_command(colon)
+        if not command:
+            return None
+        return Action(
+            line_number=line_number,
+            comments=[],
+            command=command
+        )
+
+    def _parse_command(self, colon: Token) -> str:
+        """Consume an action's tokens and return its command text.
+        
+        The command is sliced from the source line, from after the ':' (or
+        the start of the line, if the action begins on a later line) up to
+        the terminating newline or semicolon, with whitespace collapsed.
+        """
+        while self.current_token.type not in _ACTION_END_TYPES:
+            self._advance()
+        
+        end = self.current_token
+        if end.type == TokenType.EOF:
+            return ''
+        start = colon.column + 1 if end.line == colon.line else 0
+        line = self.source_lines[end.line - 1]
+        return ' '.join(line[start:end.column].split())
+
     def _get_comments_for_line(self, line_number: int) -> List[Comment]:
         """Get and remove comments associated with a specific line."""
-        associated = []
-        remaining = []
+        associated = self.comments_by_line.pop(line_number, [])
         
-        for comment in self.pending_comments:
-            if (comment.line_number == line_number or 
-                comment.associated_code_line == line_number):
-                associated.append(comment)
-            else:
-                remaining.append(comment)
+        # A comment indexed under two lines must not be handed out twice
+        for comment in associated:
+            for other in (comment.line_number, comment.associated_code_line):
+                if other is not None and other != line_number and other in self.comments_by_line:
+                    self.comments_by_line[other].remove(comment)
         
-        self.pending_comments = remaining
         return associated
 
     def _is_at_end(self) -> bool:
         """Check if we've reached the end of tokens."""
-        return self.current >= len(self.tokens)
+        return self.current_token.type == _EOF
 
     def _peek(self) -> Token:
         """Look at the current token without consuming it."""
-        if self._is_at_end():
-            return Token(TokenType.EOF, "", -1, -1)
-        return self.tokens[self.current]
+        return self.current_token
 
     def _previous(self) -> Token:
         """Get the most recently consumed token."""
-        return self.tokens[self.current - 1]
+        return self.previous_token
 
     def _advance(self) -> Token:
         """Consume the current token and return it."""
-        if not self._is_at_end():
-            self.current += 1
+        if self.current_token.type != _EOF:
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
         return self._previous()
 
     def _match(self, *types: str) -> bool:
         """Check if the current token matches any of the given types."""
-        for type in types:
-            if self._check(type):
-                self._advance()
-                return True
+        token = self.current_token
+        if token.type != _EOF and token.type in types:
+            # Consume it in place: the EOF check is already done
+            self.previous_token = token
+            self.current_token = next(self.tokens)
+            return True
         return False
 
-    def _check(self, *types: str) -> bool:
-        """Check if the current token is of any of the given types."""
-        if self._is_at_end():
-            return False
-        return self._peek().type in types
-
     def _skip_whitespace(self) -> None:
-        """Skip any whitespace tokens."""
-        while self._match(TokenType.WHITESPACE, TokenType.NEWLINE):
-            pass
\ No newline at end of file
+        """Skip any newline tokens; other whitespace is never tokenized."""
+        while self.current_token.type == _NEWLINE:
+            self._advance()
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_cached(content: str) -> MerakiAST:
+    """Parse content with a fresh parser; the result must not be mutated."""
+    return MerakiParser()._parse(content)
+
+
+# A cached AST is copied node by node rather than with copy.deepcopy, which
+# walks it generically through __reduce_ex__ and costs about as much as
+# parsing again. Parsed ASTs are trees of fresh nodes and containers sharing
+# only immutable values, so rebuilding each node gives the same independent
+# copy. Nodes are rebuilt from their dataclass fields, so fields added to
+# ast_nodes are copied without changes here. Fields with init=False are
+# not __init__ parameters; the node sets them itself when rebuilt
+
+# Names of the __init__ fields of each AST node class, looked up once per class
+_NODE_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _copy_node(value):
+    """Copy an AST value: nodes, lists and dicts are rebuilt, the rest shared."""
+    cls = type(value)
+    if cls is list:
+        return [_copy_node(item) for item in value]
+    if cls is dict:
+        return {key: _copy_node(item) for key, item in value.items()}
+    
+    names = _NODE_FIELDS.get(cls)
+    if names is None:
+        if not dataclasses.is_dataclass(cls):
+            return value  # str, int, None or an enum member
+        names = _NODE_FIELDS[cls] = tuple(
+            field.name for field in dataclasses.fields(cls) if field.init
+        )
+    return cls(**{name: _copy_node(getattr(value, name)) for name in names})
+
+
+def _copy_ast(ast: MerakiAST) -> MerakiAST:
+    """Copy a parsed AST, so the copy can be modified freely."""
+    return _copy_node(ast)
@@ -80,7 +80,7 @@ def test_performance_with_large_config():
     large_config = """
     # Large configuration with many bindings
     """ + "\n".join([
-        f"mod1 - {chr(97+i)} : open -a App{i}" for i in range(1000)
+        f"mod1 - k{i} : open -a App{i}" for i in range(1000)
     ])
     
     try:
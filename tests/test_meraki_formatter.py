@@ -125,4 +125,24 @@ mod1-y~down~repeat:resize_window"""
 mod1 - x ~up : hide_menu
 mod1 - y ~down ~repeat : resize_window"""
     
-    assert formatter.format_string(input_text) == expected 
\ No newline at end of file
+    assert formatter.format_string(input_text) == expected
+
+def test_format_comment_lines_with_separators():
+    formatter = MerakiFormatter()
+    input_text = """# Note: keep this
+# mod1 = lcmd + lalt
+# hyper-key: x
+mod1 - l : {
+# close with }
+h : open -a Safari;
+}"""
+    
+    expected = """# Note: keep this
+# mod1 = lcmd + lalt
+# hyper-key: x
+mod1 - l : {
+    # close with }
+    h : open -a Safari;
+}"""
+    
+    assert formatter.format_string(input_text) == expected
@@ -1,10 +1,16 @@
 import pytest
 import logging
+import dataclasses
+import threading
 from src.parser.meraki_parser import (
     MerakiParser,
     CommentType,
     Comment,
-    ParseError
+    ParseError,
+    MAX_CACHED_CONTENT_LENGTH,
+    _copy_ast,
+    _copy_node,
+    _parse_cached
 )
 
 # Configure logging
@@ -164,4 +170,121 @@ mod2 + shift - n : create_space"""
     binding = result.keybindings[0]
     assert binding.key_combination == "mod2 shift"
     assert binding.key == "n"
-    assert binding.action.command == "create_space" 
\ No newline at end of file
+    assert binding.action.command == "create_space" 
+
+def _parse_with_deadline(content, seconds=5):
+    """Parse in a worker thread, failing instead of hanging if it never ends."""
+    outcome = {}
+    
+    def run():
+        try:
+            outcome["result"] = MerakiParser().parse(content)
+        except Exception as error:
+            outcome["error"] = error
+    
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(seconds)
+    if worker.is_alive():
+        pytest.fail(f"parse did not finish within {seconds}s: {content!r}")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+def test_parse_unexpected_token():
+    # These inputs used to loop forever on the unconsumed token
+    with pytest.raises(ParseError, match="Expected modifier definition or keybinding"):
+        _parse_with_deadline("}")
+    with pytest.raises(ParseError, match="Expected key or '}' in nested bindings"):
+        _parse_with_deadline("""mod1 - l : {
+    h : open -a Safari; : x
+}""")
+
+def test_parse_unexpected_character():
+    parser = MerakiParser()
+    # Stray brackets; the [500ms] timeout form is a separate matter
+    for content in ("mod1 = [lcmd + lalt", "mod1 - l ] : x"):
+        with pytest.raises(ParseError, match="Unexpected character"):
+            parser.parse(content)
+
+def _mutable_parts(value):
+    """Collect every list, dict and node object reachable from an AST value."""
+    parts = []
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, (list, dict)):
+            parts.append(item)
+            pending.extend(item.values() if isinstance(item, dict) else item)
+        elif dataclasses.is_dataclass(item):
+            parts.append(item)
+            pending.extend(getattr(item, f.name) for f in dataclasses.fields(item))
+    return parts
+
+def test_copy_ast_is_equal_and_independent():
+    parser = MerakiParser()
+    content = """# Modifiers
+mod1 = lcmd + lalt  # Command + Option
+mod1 - m : open -a Mail.app  # Opens Mail
+mod1 - l {500ms} : {
+    h : open -a Safari;  # Web browser
+    t : open -a Terminal;
+}"""
+    ast = parser.parse(content)
+    copied = _copy_ast(ast)
+    assert copied == ast
+    assert ast.keybindings[1].timeout == 500
+    assert ast.keybindings[1].nested_bindings
+    
+    original_ids = {id(part) for part in _mutable_parts(ast)}
+    assert not any(id(part) in original_ids for part in _mutable_parts(copied))
+
+def test_copy_node_skips_fields_not_in_init():
+    @dataclasses.dataclass
+    class Node:
+        keys: list
+        count: int = dataclasses.field(init=False)
+        
+        def __post_init__(self):
+            self.count = len(self.keys)
+    
+    node = Node(["lcmd", "lalt"])
+    copied = _copy_node(node)
+    assert copied == node
+    assert copied.keys is not node.keys
+
+def test_parse_cache_returns_independent_results():
+    parser = MerakiParser()
+    content = """mod1 = lcmd + lalt
+mod1 - m : open -a Mail.app"""
+    first = parser.parse(content)
+    first.modifiers["mod1"].keys.append("lshift")
+    first.keybindings[0].action.command = "changed"
+    first.keybindings.clear()
+    
+    second = parser.parse(content)
+    assert second.modifiers["mod1"].keys == ["lcmd", "lalt"]
+    assert len(second.keybindings) == 1
+    assert second.keybindings[0].action.command == "open -a Mail.app"
+
+def test_parse_large_content_bypasses_cache():
+    parser = MerakiParser()
+    content = "mod1 = lcmd + lalt\n" + "# padding\n" * (MAX_CACHED_CONTENT_LENGTH // 10)
+    assert len(content) > MAX_CACHED_CONTENT_LENGTH
+    
+    cache_info = _parse_cached.cache_info()
+    result = parser.parse(content)
+    assert _parse_cached.cache_info() == cache_info
+    assert result.modifiers["mod1"].keys == ["lcmd", "lalt"]
+
+def test_parse_subclass_bypasses_cache():
+    class UpperParser(MerakiParser):
+        def _tokenize(self, lines):
+            return super()._tokenize([line.upper() for line in lines])
+    
+    content = "mod1 = lcmd + lalt"
+    MerakiParser().parse(content)
+    cache_info = _parse_cached.cache_info()
+    result = UpperParser().parse(content)
+    assert _parse_cached.cache_info() == cache_info
+    assert result.modifiers["MOD1"].keys == ["LCMD", "LALT"]